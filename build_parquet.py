@@ -0,0 +1,15 @@
+# Parse the MLS CSV exports once and save the cleaned frames as Parquet.
+# The apps also write these snapshots on their first CSV parse; run this to
+# rebuild them ahead of time after replacing any of the CSVs.
+from data import (prepare_style_data, prepare_district_data, write_snapshot, source_hash,
+                  STYLE_CSV, DIERINGER_CSV, SUMNER_CSV, STYLE_PARQUET, DISTRICT_PARQUET)
+
+
+def main():
+    write_snapshot(prepare_style_data(), STYLE_PARQUET, source_hash([STYLE_CSV], prepare_style_data))
+    write_snapshot(prepare_district_data(), DISTRICT_PARQUET,
+                   source_hash([DIERINGER_CSV, SUMNER_CSV], prepare_district_data))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,52 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 import plotly.express as px
-import plotly.figure_factory as ff
 import plotly.graph_objects as go
-from datetime import datetime
+from data import load_district_data, make_csv
 
 st.set_page_config(page_title="School District Price Comparison", layout="wide")
 
 
-@st.cache_data
-def load_data():
-    # Load both datasets (corrected district assignments)
-    df_dieringer = pd.read_csv("Sold and Stats (1).csv")  # Dieringer data
-    df_sumner = pd.read_csv("Sold and Stats (2).csv")  # Sumner data
-
-    # Function to safely convert price columns
-    def convert_price(value):
-        if pd.isna(value):
-            return np.nan
-        if isinstance(value, str):
-            return float(value.replace(',', '').replace('$', ''))
-        return float(value)
-
-    # Function to safely convert square footage
-    def convert_sqft(value):
-        if pd.isna(value):
-            return np.nan
-        if isinstance(value, str):
-            return float(value.replace(',', ''))
-        return float(value)
-
-    # Process Sumner data
-    df_sumner['Selling Price'] = df_sumner['Selling Price'].apply(convert_price)
-    df_sumner['Square Footage'] = df_sumner['Square Footage'].apply(convert_sqft)
-    df_sumner['Price_per_SqFt'] = df_sumner['Selling Price'] / df_sumner['Square Footage']
-    df_sumner['District'] = 'Sumner-Bonney Lake'
-
-    # Process Dieringer data
-    df_dieringer['Selling Price'] = df_dieringer['Selling Price'].apply(convert_price)
-    df_dieringer['Square Footage'] = df_dieringer['Square Footage'].apply(convert_sqft)
-    df_dieringer['Price_per_SqFt'] = df_dieringer['Selling Price'] / df_dieringer['Square Footage']
-    df_dieringer['District'] = 'Dieringer'
+# Cached so the scatter and its hover template are only rebuilt when the filtered frame changes
+@st.cache_resource(max_entries=32)
+def make_scatter(filtered_df):
+    fig_scatter = px.scatter(
+        filtered_df,
+        x='Square Footage',
+        y='Selling Price',
+        color='District',
+        title='Price vs Square Footage by District',
+        labels={
+            'Selling Price': 'Selling Price ($)',
+            'Square Footage': 'Square Footage',
+            'District': 'District',
+            'Listing Number': 'MLS #'
+        },
+        hover_data={
+            'Listing Number': True,
+            'Selling Price': ':$,.0f',
+            'Square Footage': ':,.0f',
+            'District': True
+        }
+    )
 
-    # Combine datasets
-    df = pd.concat([df_sumner, df_dieringer], ignore_index=True)
+    # Update scatter plot hover template
+    fig_scatter.update_traces(
+        hovertemplate="<br>".join([
+            "MLS #: %{customdata[0]}",
+            "Price: %{y:$,.0f}",
+            "SqFt: %{x:,.0f}",
+            "District: %{customdata[3]}"
+        ])
+    )
 
-    return df
+    return fig_scatter
 
 
 def main():
     st.title("School District Housing Price Comparison")
 
     # Load the data
-    df = load_data()
+    df = load_district_data()
 
     # Filter data by district
     dieringer_data = df[df['District'] == 'Dieringer']
@@ -159,47 +152,15 @@ def main():
         st.plotly_chart(fig_ppsf, use_container_width=True)
 
     # Scatter plot with hover data
-    fig_scatter = px.scatter(
-        filtered_df,
-        x='Square Footage',
-        y='Selling Price',
-        color='District',
-        title='Price vs Square Footage by District',
-        labels={
-            'Selling Price': 'Selling Price ($)',
-            'Square Footage': 'Square Footage',
-            'District': 'District',
-            'Listing Number': 'MLS #'
-        },
-        hover_data={
-            'Listing Number': True,
-            'Selling Price': ':$,.0f',
-            'Square Footage': ':,.0f',
-            'District': True
-        }
-    )
-
-    # Update scatter plot hover template
-    fig_scatter.update_traces(
-        hovertemplate="<br>".join([
-            "MLS #: %{customdata[0]}",
-            "Price: %{y:$,.0f}",
-            "SqFt: %{x:,.0f}",
-            "District: %{customdata[3]}"
-        ])
-    )
-
+    fig_scatter = make_scatter(filtered_df[['Listing Number', 'Selling Price', 'Square Footage', 'District']])
     st.plotly_chart(fig_scatter, use_container_width=True)
 
     # Raw data section
     st.subheader("Raw Data")
-    # Create a copy of the dataframe sorted by selling price
-    df_display = filtered_df.sort_values('Selling Price', ascending=False)
-    df_display['Listing Number'] = df_display['Listing Number'].astype(str).replace(',', '', regex=True)
-    st.dataframe(df_display)
+    st.dataframe(filtered_df)
 
     # Download button for CSV
-    csv = filtered_df.to_csv(index=False)
+    csv = make_csv(filtered_df)
     st.download_button(
         label="Download Data as CSV",
         data=csv,
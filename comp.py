@@ -1,53 +1,62 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+from data import load_style_data, load_district_data, make_csv
 
 st.set_page_config(page_title="Real Estate Analysis", layout="wide")
 
 
-@st.cache_data
-def load_style_data():
-    df = pd.read_csv("Sold And StatsRamblerTwoStory.csv")
-    df['Selling Price'] = pd.to_numeric(df['Selling Price'].replace(',', '', regex=True), errors='coerce')
-    df['Square Footage'] = pd.to_numeric(df['Square Footage'].replace(',', '', regex=True), errors='coerce')
-    df['Listing Number'] = df['Listing Number'].astype(str).replace(',', '', regex=True)
-    df['Price/SqFt'] = df['Selling Price'] / df['Square Footage']
-    return df
+def box_stats(values, groups, labels):
+    # Five-number summary per group. 'hazen' matches Plotly's default quartilemethod='linear'
+    # (interpolation at p*n - 0.5); whiskers run to the min/max so no sale falls outside the box plot
+    stats = {'lowerfence': [], 'q1': [], 'median': [], 'q3': [], 'upperfence': []}
+    for label in labels:
+        v = values[groups == label]
+        v = v[~np.isnan(v)]
+        for key, q in zip(stats, np.quantile(v, [0, 0.25, 0.5, 0.75, 1.0], method='hazen')):
+            stats[key].append(q)
+    return stats
 
 
-@st.cache_data
-def load_district_data():
-    df_dieringer = pd.read_csv("Sold And StatsSchool-Dieringer.csv")  # Dieringer data
-    df_sumner = pd.read_csv("Sold And Stats-Sumner.csv")  # Sumner data
+@st.cache_resource
+def build_style_figures(df):
+    home_type = df['Style Code'].cat.rename_categories({'10 - 1 Story': 'Ramblers', '12 - 2 Story': '2-Story'})
+    labels = list(home_type.cat.categories)
+    home_type = home_type.to_numpy()
 
-    def convert_price(value):
-        if pd.isna(value):
-            return np.nan
-        if isinstance(value, str):
-            return float(value.replace(',', '').replace('$', ''))
-        return float(value)
+    fig_price = go.Figure(go.Box(x=labels, name='', **box_stats(df['Selling Price'].to_numpy(), home_type, labels)))
+    fig_price.update_layout(title='Price Distribution by Home Type', yaxis_title='Selling Price ($)')
 
-    def convert_sqft(value):
-        if pd.isna(value):
-            return np.nan
-        if isinstance(value, str):
-            return float(value.replace(',', ''))
-        return float(value)
+    fig_ppsf = go.Figure(go.Box(x=labels, name='', **box_stats(df['Price/SqFt'].to_numpy(), home_type, labels)))
+    fig_ppsf.update_layout(title='Price per SqFt Distribution', yaxis_title='Price per Square Foot ($)')
 
-    for df in [df_dieringer, df_sumner]:
-        df['Selling Price'] = df['Selling Price'].apply(convert_price)
-        df['Square Footage'] = df['Square Footage'].apply(convert_sqft)
-        df['Price_per_SqFt'] = df['Selling Price'] / df['Square Footage']
+    fig_scatter = px.scatter(df, x='Square Footage', y='Selling Price',
+                             color='Style Code', title='Price vs Square Footage',
+                             hover_data={'Listing Number': True, 'Selling Price': ':$,.0f',
+                                         'Square Footage': ':,.0f', 'Style Code': True})
+    return fig_price, fig_ppsf, fig_scatter
+
+
+@st.cache_resource
+def build_district_figures(df):
+    labels = list(df['District'].cat.categories)
+    district = df['District'].to_numpy()
 
-    df_dieringer['District'] = 'Dieringer'
-    df_sumner['District'] = 'Sumner-Bonney Lake'
+    fig_box = go.Figure(go.Box(x=labels, name='', **box_stats(df['Selling Price'].to_numpy(), district, labels)))
+    fig_box.update_layout(title='Price Distribution by District', yaxis_title='Selling Price ($)')
 
-    return pd.concat([df_sumner, df_dieringer], ignore_index=True)
+    fig_ppsf = go.Figure(go.Box(x=labels, name='', **box_stats(df['Price_per_SqFt'].to_numpy(), district, labels)))
+    fig_ppsf.update_layout(title='Price per SqFt Distribution', yaxis_title='Price per Square Foot ($)')
+
+    fig_scatter = px.scatter(df, x='Square Footage', y='Selling Price',
+                             color='District', title='Price vs Square Footage',
+                             hover_data={'Listing Number': True, 'Selling Price': ':$,.0f',
+                                         'Square Footage': ':,.0f', 'District': True})
+    return fig_box, fig_ppsf, fig_scatter
 
 
-def show_style_analysis(df):
+def show_style_analysis(df, one_mask, two_mask):
     st.title("Bonney Lake Real Estate Analysis: Rambler vs 2-Story Homes")
 
     with st.expander("📋 Data Collection Criteria", expanded=True):
@@ -64,58 +73,39 @@ def show_style_analysis(df):
         Premium or luxury properties may command different premiums than shown here.
     """)
 
-    one_story = df[df['Style Code'] == '10 - 1 Story']
-    two_story = df[df['Style Code'] == '12 - 2 Story']
+    price = df['Selling Price'].to_numpy()
+    ppsf = df['Price/SqFt'].to_numpy()
 
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Number of Ramblers", f"{len(one_story)}")
-        st.metric("Number of 2-Story", f"{len(two_story)}")
+        st.metric("Number of Ramblers", f"{one_mask.sum()}")
+        st.metric("Number of 2-Story", f"{two_mask.sum()}")
     with col2:
-        st.metric("Avg Rambler Price", f"${one_story['Selling Price'].mean():,.0f}")
-        st.metric("Avg 2-Story Price", f"${two_story['Selling Price'].mean():,.0f}")
+        st.metric("Avg Rambler Price", f"${np.nanmean(price[one_mask]):,.0f}")
+        st.metric("Avg 2-Story Price", f"${np.nanmean(price[two_mask]):,.0f}")
     with col3:
-        rambler_price_sqft = one_story['Price/SqFt'].mean()
-        two_story_price_sqft = two_story['Price/SqFt'].mean()
+        rambler_price_sqft = np.nanmean(ppsf[one_mask])
+        two_story_price_sqft = np.nanmean(ppsf[two_mask])
         premium = ((rambler_price_sqft - two_story_price_sqft) / two_story_price_sqft) * 100
         st.metric("Avg Rambler $/SqFt", f"${rambler_price_sqft:.2f}")
         st.metric("Avg 2-Story $/SqFt", f"${two_story_price_sqft:.2f}")
         st.metric("Rambler Premium", f"{premium:.1f}%")
 
+    # The figures only need these columns; trimming keeps the cache-key hash off the full MLS export
+    fig_price, fig_ppsf, fig_scatter = build_style_figures(
+        df[['Listing Number', 'Selling Price', 'Square Footage', 'Price/SqFt', 'Style Code']])
+
     col1, col2 = st.columns(2)
     with col1:
-        fig_price = go.Figure()
-        fig_price.add_trace(go.Box(y=one_story['Selling Price'], name='Ramblers',
-                                   customdata=one_story['Listing Number'],
-                                   hovertemplate="MLS #: %{customdata}<br>Price: $%{y:,.0f}"))
-        fig_price.add_trace(go.Box(y=two_story['Selling Price'], name='2-Story',
-                                   customdata=two_story['Listing Number'],
-                                   hovertemplate="MLS #: %{customdata}<br>Price: $%{y:,.0f}"))
-        fig_price.update_layout(title='Price Distribution by Home Type', yaxis_title='Selling Price ($)')
         st.plotly_chart(fig_price, use_container_width=True)
-
     with col2:
-        fig_ppsf = go.Figure()
-        fig_ppsf.add_trace(go.Box(y=one_story['Price/SqFt'], name='Ramblers',
-                                  customdata=one_story['Listing Number'],
-                                  hovertemplate="MLS #: %{customdata}<br>$/SqFt: $%{y:.2f}"))
-        fig_ppsf.add_trace(go.Box(y=two_story['Price/SqFt'], name='2-Story',
-                                  customdata=two_story['Listing Number'],
-                                  hovertemplate="MLS #: %{customdata}<br>$/SqFt: $%{y:.2f}"))
-        fig_ppsf.update_layout(title='Price per SqFt Distribution', yaxis_title='Price per Square Foot ($)')
         st.plotly_chart(fig_ppsf, use_container_width=True)
 
-    filtered_df = df[df['Style Code'].isin(['10 - 1 Story', '12 - 2 Story'])]
-    fig_scatter = px.scatter(filtered_df, x='Square Footage', y='Selling Price',
-                             color='Style Code', title='Price vs Square Footage',
-                             hover_data={'Listing Number': True, 'Selling Price': ':$,.0f',
-                                         'Square Footage': ':,.0f', 'Style Code': True})
     st.plotly_chart(fig_scatter, use_container_width=True)
 
     st.subheader("Raw Data")
-    df_display = filtered_df.sort_values('Selling Price', ascending=False)
-    st.dataframe(df_display)
-    csv = filtered_df.to_csv(index=False)
+    st.dataframe(df)
+    csv = make_csv(df)
     st.download_button("Download Data as CSV", csv, "style_analysis.csv", "text/csv")
 
 
@@ -138,61 +128,40 @@ def show_district_analysis(df):
         Premium or luxury properties may command different premiums than shown here. 
     """)
 
-    dieringer_data = df[df['District'] == 'Dieringer']
-    sumner_data = df[df['District'] == 'Sumner-Bonney Lake']
+    dieringer_mask = (df['District'] == 'Dieringer').to_numpy()
+    sumner_mask = ~dieringer_mask
+    price = df['Selling Price'].to_numpy()
+    ppsf = df['Price_per_SqFt'].to_numpy()
 
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Number of Dieringer Homes", f"{len(dieringer_data)}")
-        st.metric("Number of Sumner Homes", f"{len(sumner_data)}")
+        st.metric("Number of Dieringer Homes", f"{dieringer_mask.sum()}")
+        st.metric("Number of Sumner Homes", f"{sumner_mask.sum()}")
     with col2:
-        st.metric("Avg Dieringer Price", f"${dieringer_data['Selling Price'].mean():,.0f}")
-        st.metric("Avg Sumner Price", f"${sumner_data['Selling Price'].mean():,.0f}")
+        st.metric("Avg Dieringer Price", f"${np.nanmean(price[dieringer_mask]):,.0f}")
+        st.metric("Avg Sumner Price", f"${np.nanmean(price[sumner_mask]):,.0f}")
     with col3:
-        dieringer_price_sqft = dieringer_data['Price_per_SqFt'].mean()
-        sumner_price_sqft = sumner_data['Price_per_SqFt'].mean()
+        dieringer_price_sqft = np.nanmean(ppsf[dieringer_mask])
+        sumner_price_sqft = np.nanmean(ppsf[sumner_mask])
         premium = ((dieringer_price_sqft - sumner_price_sqft) / sumner_price_sqft) * 100
         st.metric("Avg Dieringer $/SqFt", f"${dieringer_price_sqft:.2f}")
         st.metric("Avg Sumner $/SqFt", f"${sumner_price_sqft:.2f}")
         st.metric("Dieringer Premium", f"{premium:.1f}%")
 
+    fig_box, fig_ppsf, fig_scatter = build_district_figures(
+        df[['Listing Number', 'Selling Price', 'Square Footage', 'Price_per_SqFt', 'District']])
+
     col1, col2 = st.columns(2)
     with col1:
-        fig_box = go.Figure()
-        fig_box.add_trace(go.Box(y=df[df['District'] == 'Dieringer']['Selling Price'],
-                                 name='Dieringer',
-                                 customdata=df[df['District'] == 'Dieringer']['Listing Number'],
-                                 hovertemplate="MLS #: %{customdata}<br>Price: $%{y:,.0f}"))
-        fig_box.add_trace(go.Box(y=df[df['District'] == 'Sumner-Bonney Lake']['Selling Price'],
-                                 name='Sumner-Bonney Lake',
-                                 customdata=df[df['District'] == 'Sumner-Bonney Lake']['Listing Number'],
-                                 hovertemplate="MLS #: %{customdata}<br>Price: $%{y:,.0f}"))
-        fig_box.update_layout(title='Price Distribution by District', yaxis_title='Selling Price ($)')
         st.plotly_chart(fig_box, use_container_width=True)
-
     with col2:
-        fig_ppsf = go.Figure()
-        fig_ppsf.add_trace(go.Box(y=df[df['District'] == 'Dieringer']['Price_per_SqFt'],
-                                  name='Dieringer',
-                                  customdata=df[df['District'] == 'Dieringer']['Listing Number'],
-                                  hovertemplate="MLS #: %{customdata}<br>$/SqFt: $%{y:.2f}"))
-        fig_ppsf.add_trace(go.Box(y=df[df['District'] == 'Sumner-Bonney Lake']['Price_per_SqFt'],
-                                  name='Sumner-Bonney Lake',
-                                  customdata=df[df['District'] == 'Sumner-Bonney Lake']['Listing Number'],
-                                  hovertemplate="MLS #: %{customdata}<br>$/SqFt: $%{y:.2f}"))
-        fig_ppsf.update_layout(title='Price per SqFt Distribution', yaxis_title='Price per Square Foot ($)')
         st.plotly_chart(fig_ppsf, use_container_width=True)
 
-    fig_scatter = px.scatter(df, x='Square Footage', y='Selling Price',
-                             color='District', title='Price vs Square Footage',
-                             hover_data={'Listing Number': True, 'Selling Price': ':$,.0f',
-                                         'Square Footage': ':,.0f', 'District': True})
     st.plotly_chart(fig_scatter, use_container_width=True)
 
     st.subheader("Raw Data")
-    df_display = df.sort_values('Selling Price', ascending=False)
-    st.dataframe(df_display)
-    csv = df.to_csv(index=False)
+    st.dataframe(df)
+    csv = make_csv(df)
     st.download_button("Download Data as CSV", csv, "district_comparison.csv", "text/csv")
 
 
@@ -201,7 +170,7 @@ def main():
     tab1, tab2 = st.tabs(["Home Style Analysis", "School District Comparison"])
 
     with tab1:
-        show_style_analysis(load_style_data())
+        show_style_analysis(*load_style_data())
     with tab2:
         show_district_analysis(load_district_data())
 
@@ -0,0 +1,133 @@
+import hashlib
+import inspect
+import os
+import tempfile
+
+import streamlit as st
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv
+import pyarrow.parquet
+
+STYLE_CSV = "Sold And StatsRamblerTwoStory.csv"
+DIERINGER_CSV = "Sold And StatsSchool-Dieringer.csv"
+SUMNER_CSV = "Sold And Stats-Sumner.csv"
+
+# Written on the first CSV parse (or by build_parquet.py); tagged with a hash of their source CSVs
+# and of the cleanup code that produced them
+STYLE_PARQUET = "style.parquet"
+DISTRICT_PARQUET = "district.parquet"
+SOURCE_HASH_KEY = b'source_sha256'
+
+
+def read_sales_csv(path):
+    df = pd.read_csv(path, engine='pyarrow')
+    # The MLS export repeats 'Listing Number'; keep only the first copy
+    return df.loc[:, ~df.columns.duplicated()]
+
+
+def parse_number(s, strip=','):
+    # Arrow already parses clean numeric columns; only fall back to string cleanup when it could not
+    if not pd.api.types.is_numeric_dtype(s):
+        s = s.astype(str)
+        for ch in strip:
+            s = s.str.replace(ch, '', regex=False)
+    return pd.to_numeric(s, errors='coerce', downcast='float')
+
+
+def prepare_style_data():
+    df = read_sales_csv(STYLE_CSV)
+    df['Selling Price'] = parse_number(df['Selling Price'])
+    df['Square Footage'] = parse_number(df['Square Footage'])
+    df['Listing Number'] = df['Listing Number'].astype(str)
+    df['Price/SqFt'] = df.eval('`Selling Price` / `Square Footage`')
+    df['Style Code'] = df['Style Code'].astype('category')
+
+    mask = df['Style Code'].isin(['10 - 1 Story', '12 - 2 Story']).to_numpy()
+    df_f = df.loc[mask].sort_values('Selling Price', ascending=False).reset_index(drop=True)
+    df_f['Style Code'] = df_f['Style Code'].cat.remove_unused_categories()
+    return df_f
+
+
+def prepare_district_data():
+    df_dieringer = read_sales_csv(DIERINGER_CSV)  # Dieringer data
+    df_sumner = read_sales_csv(SUMNER_CSV)  # Sumner data
+
+    for df in [df_dieringer, df_sumner]:
+        df['Selling Price'] = parse_number(df['Selling Price'], strip=',$')
+        df['Square Footage'] = parse_number(df['Square Footage'])
+        df['Listing Number'] = df['Listing Number'].astype(str)
+        df['Price_per_SqFt'] = df.eval('`Selling Price` / `Square Footage`')
+
+    df_dieringer['District'] = 'Dieringer'
+    df_sumner['District'] = 'Sumner-Bonney Lake'
+
+    df = pd.concat([df_sumner, df_dieringer]).sort_values('Selling Price', ascending=False).reset_index(drop=True)
+    df['District'] = df['District'].astype('category')
+    return df
+
+
+def source_hash(csv_paths, prepare):
+    h = hashlib.sha256()
+    # Editing the cleanup code must invalidate snapshots just like editing the CSVs
+    for func in (read_sales_csv, parse_number, prepare):
+        h.update(inspect.getsource(func).encode())
+    for path in csv_paths:
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest().encode()
+
+
+def write_snapshot(df, parquet_path, digest):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, SOURCE_HASH_KEY: digest})
+    # Write to a temp file and rename it into place so readers never see a partial snapshot
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(parquet_path)),
+                                    prefix=os.path.basename(parquet_path) + '.', suffix='.tmp.parquet')
+    os.close(fd)
+    try:
+        pa.parquet.write_table(table, tmp_path)
+        os.replace(tmp_path, parquet_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def read_prepared(parquet_path, csv_paths, prepare):
+    # Use the snapshot only if it was built from these exact CSVs; mtimes are reset by git checkouts
+    digest = source_hash(csv_paths, prepare)
+    if os.path.exists(parquet_path):
+        try:
+            metadata = pa.parquet.read_schema(parquet_path).metadata or {}
+            if metadata.get(SOURCE_HASH_KEY) == digest:
+                return pd.read_parquet(parquet_path)
+        except (OSError, pa.ArrowInvalid):
+            pass  # Unreadable snapshot; rebuild it from the CSVs below
+
+    df = prepare()
+    try:
+        write_snapshot(df, parquet_path, digest)
+    except OSError:
+        pass  # Read-only filesystem; keep serving the freshly parsed frame
+    return df
+
+
+@st.cache_data
+def load_style_data():
+    df = read_prepared(STYLE_PARQUET, [STYLE_CSV], prepare_style_data)
+    one_mask = (df['Style Code'] == '10 - 1 Story').to_numpy()
+    two_mask = ~one_mask
+    return df, one_mask, two_mask
+
+
+@st.cache_data
+def load_district_data():
+    return read_prepared(DISTRICT_PARQUET, [DIERINGER_CSV, SUMNER_CSV], prepare_district_data)
+
+
+@st.cache_data
+def make_csv(df):
+    # Arrow's C++ CSV writer instead of the row-by-row Python formatting in DataFrame.to_csv
+    buf = pa.BufferOutputStream()
+    pa.csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue().to_pybytes()